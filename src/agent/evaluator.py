@@ -65,10 +65,21 @@ class Evaluator:
     # ------------------------------------------------------------------
     # Public entry point
     # ------------------------------------------------------------------
-    def evaluate(self, file_path: str) -> Dict[str, Any]:
+    def evaluate(
+        self, file_path: str, source_code: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         Run the Detective → Judge → Scoring pipeline on *file_path*.
 
+        Parameters
+        ----------
+        file_path : str
+            Path to the source file.
+        source_code : str | None
+            Pre-read file contents. Pass these when the caller has already
+            read the file (e.g. the CLI reads each file once up front) so
+            the worker does not hit the disk a second time.
+
         Returns a dict with keys: ``file``, ``language``, ``score``,
         ``violations``, ``summary``, and ``error`` (if something went wrong).
         """
@@ -84,7 +95,8 @@ class Evaluator:
                 f"Unsupported file type: '{path.suffix}'.",
             )
 
-        source_code = path.read_text(encoding="utf-8", errors="replace")
+        if source_code is None:
+            source_code = path.read_text(encoding="utf-8", errors="replace")
         if not source_code.strip():
             return self._error_result(file_path, "File is empty.")
 
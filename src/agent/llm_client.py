@@ -16,15 +16,30 @@ from src.utils.config import settings
 
 logger = logging.getLogger(__name__)
 
-# Re-usable session per thread (connection-pooling friendly).
-_thread_local = threading.local()
+# One shared session for the whole process. requests.Session is thread-safe
+# for issuing requests, and a single urllib3 pool sized for the worker count
+# lets all threads reuse keep-alive connections instead of each thread
+# re-doing TCP/TLS handshakes against a default pool of 10.
+_session_lock = threading.Lock()
+_session: Optional[requests.Session] = None
 
 
 def _get_session() -> requests.Session:
-    """Return a per-thread ``requests.Session``."""
-    if not hasattr(_thread_local, "session"):
-        _thread_local.session = requests.Session()
-    return _thread_local.session
+    """Return the shared, pool-configured ``requests.Session``."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                pool_size = max(32, settings.max_workers * 2)
+                session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(
+                    pool_connections=pool_size,
+                    pool_maxsize=pool_size,
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _session = session
+    return _session
 
 
 class LLMClient:
@@ -61,6 +76,21 @@ class LLMClient:
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
+    def warm_up(self) -> None:
+        """
+        Open a connection to the endpoint ahead of the first ``chat`` call.
+
+        Issues a cheap ``GET /v1/models`` so the first batch of parallel
+        workers reuses an established keep-alive connection instead of all
+        paying the TCP/TLS handshake at once. Failures are ignored – not
+        every backend exposes the models route.
+        """
+        base = self.api_url.split("/v1/", 1)[0]
+        try:
+            _get_session().get(f"{base}/v1/models", timeout=5)
+        except requests.RequestException:
+            logger.debug("LLM warm-up request failed; continuing without it.")
+
     def chat(
         self,
         messages: List[Dict[str, str]],
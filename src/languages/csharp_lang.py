@@ -7,6 +7,19 @@ from __future__ import annotations
 import json
 from typing import Any, Dict, List, Set
 
+# The Detective's issue list is re-serialized into the Judge prompt per
+# file; orjson (when installed) does this several times faster. The tool
+# results themselves stay plain dicts - that shape is the documented
+# contract consumed by the prompt builders and scoring.
+try:
+    import orjson
+
+    def _dump_issues(issues: List[Dict[str, Any]]) -> str:
+        return orjson.dumps(issues, option=orjson.OPT_INDENT_2).decode("utf-8")
+except ImportError:
+    def _dump_issues(issues: List[Dict[str, Any]]) -> str:
+        return json.dumps(issues, indent=2)
+
 from src.languages.base import LanguageProfile
 from src.tools.csharp_analyzer import CSharpTools
 from src.tools.semgrep_analyzer import format_semgrep_summary
@@ -144,7 +157,7 @@ class CSharpProfile(LanguageProfile):
         filtered_build = self.filter_lint(tools)
 
         issues_text = (
-            json.dumps(potential_issues, indent=2)
+            _dump_issues(potential_issues)
             if potential_issues
             else "[]  (Detective found no potential issues.)"
         )
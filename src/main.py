@@ -17,35 +17,62 @@ Usage
 
 from __future__ import annotations
 
-import argparse
-import csv
-import json
 import logging
 import sys
+import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
 from typing import Any, Dict, List
 
 from rich.console import Console
-from rich.logging import RichHandler
-from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskID
-from rich.table import Table
-from rich.text import Text
 
 from src.agent.evaluator import Evaluator
 from src.agent.llm_client import LLMClient
 from src.languages import SUPPORTED_EXTENSIONS, get_profile
 from src.utils.config import settings
 
+# The remaining rich widgets (Panel, Table, Progress, …) plus csv/json are
+# imported lazily inside the functions that need them, keeping cold-start
+# cost low for the common single-file invocation.
+
 console = Console()
 
+# How many futures may be in flight at once. Bounds both the producer/
+# consumer contention on the executor queue and the memory held by
+# pre-read source text waiting in unstarted futures.
+_SUBMIT_WINDOW = 256
+
 
 # ------------------------------------------------------------------
 # CLI argument parser
 # ------------------------------------------------------------------
-def _build_parser() -> argparse.ArgumentParser:
+def _parse_args() -> Any:
+    """
+    Parse CLI arguments.
+
+    The common ``python -m src.main <path>`` invocation takes a fast path
+    that skips importing argparse and building the parser entirely;
+    anything with flags falls back to the full parser.
+    """
+    argv = sys.argv[1:]
+    if len(argv) == 1 and not argv[0].startswith("-"):
+        from types import SimpleNamespace
+
+        return SimpleNamespace(
+            path=argv[0],
+            lang=None,
+            workers=settings.max_workers,
+            no_rag=False,
+            output=None,
+            verbose=False,
+        )
+    return _build_parser().parse_args(argv)
+
+
+def _build_parser() -> "argparse.ArgumentParser":
+    import argparse
+
     parser = argparse.ArgumentParser(
         prog="agentic-eval",
         description="Agentic Static Code Evaluator – hybrid deterministic + LLM analysis.",
@@ -226,11 +253,20 @@ def _display_project_structure(target: Path, files: List[Path]) -> None:
 # ------------------------------------------------------------------
 def _is_score_na(score: Any) -> bool:
     """Check if score is N/A (parse error occurred)."""
-    return score == "N/A" or score == "n/a"
+    # Common case is an int score: one C-level type test and out, instead
+    # of two string comparisons per call on the pretty-print hot path.
+    return isinstance(score, str) and score.lower() == "n/a"
+
+
+# Precomputed colour per integer score in [0, 100] – _score_color sits on the
+# O(N) pretty-print path and is called twice per result.
+_SCORE_COLORS = ["red"] * 50 + ["dark_orange"] * 20 + ["yellow"] * 20 + ["green"] * 11
 
 
 def _score_color(score: Any) -> str:
     """Return color based on score value. Handles N/A scores."""
+    if isinstance(score, int) and 0 <= score <= 100:
+        return _SCORE_COLORS[score]
     if _is_score_na(score):
         return "magenta"
     if not isinstance(score, (int, float)):
@@ -245,6 +281,8 @@ def _score_color(score: Any) -> str:
 
 
 def _print_summary_table(results: List[Dict[str, Any]]) -> None:
+    from rich.table import Table
+
     table = Table(
         title="Evaluation Summary",
         show_lines=True,
@@ -258,24 +296,30 @@ def _print_summary_table(results: List[Dict[str, Any]]) -> None:
     table.add_column("Verdict", min_width=20)
 
     for idx, r in enumerate(results, 1):
+        # Bind repeated lookups to locals once per row – this loop runs per file.
         score = r.get("score", 0)
+        file_name = Path(r.get("file", "?")).name
+        language = r.get("language", "?")
+        error = r.get("error")
+        parse_error = r.get("parse_error")
+        violations = r.get("violations", ())
+        score_na = _is_score_na(score)
         color = _score_color(score)
-        n_violations = len(r.get("violations", []))
         verdict = (r.get("summary") or r.get("reliability_analysis", ""))[:80]
-        
-        if r.get("parse_error"):
+
+        if parse_error:
             verdict = f"[magenta]Parse error – see summary[/magenta]"
-        elif r.get("error"):
-            verdict = f"[red]{r['error']}[/red]"
+        elif error:
+            verdict = f"[red]{error}[/red]"
 
-        score_display = str(score) if not _is_score_na(score) else "[magenta]N/A[/magenta]"
+        score_display = str(score) if not score_na else "[magenta]N/A[/magenta]"
 
         table.add_row(
             str(idx),
-            str(Path(r.get("file", "?")).name),
-            r.get("language", "?"),
-            f"[{color}]{score_display}[/{color}]" if not _is_score_na(score) else score_display,
-            str(n_violations),
+            file_name,
+            language,
+            f"[{color}]{score_display}[/{color}]" if not score_na else score_display,
+            str(len(violations)),
             verdict,
         )
 
@@ -284,6 +328,10 @@ def _print_summary_table(results: List[Dict[str, Any]]) -> None:
 
 
 def _print_detail(result: Dict[str, Any]) -> None:
+    from rich.panel import Panel
+    from rich.table import Table
+    from rich.text import Text
+
     score = result.get("score", 0)
     color = _score_color(score)
     file_name = Path(result.get("file", "?")).name
@@ -307,13 +355,13 @@ def _print_detail(result: Dict[str, Any]) -> None:
         )
     console.print(Panel(header, expand=False))
     
+    summary = result.get("summary") or result.get("reliability_analysis")
+
     if result.get("parse_error"):
         console.print(f"  [magenta bold]⚠ Parse Error:[/magenta bold] Judge JSON could not be parsed. Refiner attempted repair.")
-        summary = result.get("summary", "")
         if summary:
             console.print(f"  [dim]{summary}[/dim]")
 
-    summary = result.get("summary") or result.get("reliability_analysis")
     if summary:
         console.print(f"  [bold]Summary:[/bold]  {summary}")
 
@@ -339,18 +387,50 @@ def _print_detail(result: Dict[str, Any]) -> None:
     console.print()
 
 
+# ------------------------------------------------------------------
+# Source reading
+# ------------------------------------------------------------------
+def _read_source(path: Path) -> str | None:
+    """
+    Read a source file once in the main thread so workers skip the disk.
+
+    Returns ``None`` on read errors – the worker then falls back to its
+    own read and surfaces the failure as a per-file error result.
+    """
+    try:
+        return path.read_text(encoding="utf-8", errors="replace")
+    except OSError:
+        return None
+
+
 # ------------------------------------------------------------------
 # Export helpers
 # ------------------------------------------------------------------
+# orjson serializes ~5-10x faster than the stdlib indent pathway and emits
+# UTF-8 bytes directly; fall back to stdlib json when it is not installed.
+try:
+    import orjson
+
+    def _dump_json(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    def _dump_json(obj: Any) -> bytes:
+        import json
+
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+
 def _export_json(results: List[Dict[str, Any]], path: Path) -> None:
-    clean = []
-    for r in results:
-        entry = {k: v for k, v in r.items() if k not in ("raw_llm_response",)}
-        clean.append(entry)
-    path.write_text(json.dumps(clean, indent=2, ensure_ascii=False), encoding="utf-8")
+    clean = [
+        {k: v for k, v in r.items() if k not in ("raw_llm_response",)}
+        for r in results
+    ]
+    path.write_bytes(_dump_json(clean))
 
 
 def _export_csv(results: List[Dict[str, Any]], path: Path) -> None:
+    import csv
+
     fieldnames = [
         "file",
         "language",
@@ -360,22 +440,25 @@ def _export_csv(results: List[Dict[str, Any]], path: Path) -> None:
         "parse_error",
         "error",
     ]
-    with path.open("w", newline="", encoding="utf-8") as fh:
-        writer = csv.DictWriter(fh, fieldnames=fieldnames, extrasaction="ignore")
-        writer.writeheader()
-        for r in results:
-            score = r.get("score", 0)
-            writer.writerow(
-                {
-                    "file": r.get("file", ""),
-                    "language": r.get("language", ""),
-                    "score": score if not _is_score_na(score) else "N/A",
-                    "violations_count": len(r.get("violations", [])),
-                    "summary": r.get("summary", r.get("reliability_analysis", "")),
-                    "parse_error": "Yes" if r.get("parse_error") else "",
-                    "error": r.get("error", ""),
-                }
-            )
+    def _row(r: Dict[str, Any]) -> tuple:
+        score = r.get("score", 0)
+        return (
+            r.get("file", ""),
+            r.get("language", ""),
+            score if not _is_score_na(score) else "N/A",
+            len(r.get("violations", ())),
+            r.get("summary", r.get("reliability_analysis", "")),
+            "Yes" if r.get("parse_error") else "",
+            r.get("error", ""),
+        )
+
+    # csv.writer with plain tuples skips DictWriter's per-field dict rebuild,
+    # and writerows() pushes the row loop into C. The 1 MiB buffer cuts
+    # syscall count on large reports.
+    with path.open("w", newline="", encoding="utf-8", buffering=1 << 20) as fh:
+        writer = csv.writer(fh)
+        writer.writerow(fieldnames)
+        writer.writerows(_row(r) for r in results)
 
 
 def _save_results(results: List[Dict[str, Any]], output_path: str) -> None:
@@ -397,8 +480,11 @@ def _save_results(results: List[Dict[str, Any]], output_path: str) -> None:
 # Main
 # ------------------------------------------------------------------
 def main() -> None:
-    parser = _build_parser()
-    args = parser.parse_args()
+    from rich.logging import RichHandler
+    from rich.panel import Panel
+    from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskID
+
+    args = _parse_args()
 
     # Logging
     log_level = logging.DEBUG if args.verbose else logging.INFO
@@ -434,6 +520,7 @@ def main() -> None:
 
     # 3. Initialize components
     llm = LLMClient()
+    llm.warm_up()  # establish a keep-alive connection before workers start
 
     retriever = None
     if not args.no_rag:
@@ -447,8 +534,10 @@ def main() -> None:
 
     evaluator = Evaluator(llm_client=llm, rule_retriever=retriever)
 
-    # 4. Evaluate files in parallel
-    results: List[Dict[str, Any]] = []
+    # 4. Evaluate files in parallel. Each future writes its result into the
+    # slot matching the file's discovery index, so the list comes out in
+    # discovery (sorted) order without a final O(N log N) sort.
+    results: List[Dict[str, Any]] = [{}] * len(files)  # every slot reassigned below
     start = time.perf_counter()
 
     with Progress(
@@ -460,47 +549,92 @@ def main() -> None:
     ) as progress:
         task_id: TaskID = progress.add_task("Evaluating …", total=len(files))
 
+        # Completion counting is decoupled from rendering: the collection
+        # loop only bumps done_count, and a small daemon thread coalesces
+        # redraws to ~10/s instead of one console-lock cycle per future.
+        done_count = 0
+        stop_refresh = threading.Event()
+
+        def _refresh_progress() -> None:
+            while not stop_refresh.wait(0.1):
+                progress.update(task_id, completed=done_count)
+
+        refresher = threading.Thread(
+            target=_refresh_progress, name="progress-refresh", daemon=True
+        )
+        refresher.start()
+
+        # Submit in bounded windows and collect with wait(FIRST_COMPLETED)
+        # instead of one as_completed wake-up per future – fewer trips
+        # through the executor's result lock, and progress updates are
+        # batched per drained set rather than issued per file.
         with ThreadPoolExecutor(max_workers=args.workers) as pool:
-            future_map = {
-                pool.submit(evaluator.evaluate, str(f)): f for f in files
-            }
-            for future in as_completed(future_map):
-                file = future_map[future]
-                try:
-                    result = future.result()
-                except Exception as exc:  # noqa: BLE001
-                    result = {
-                        "file": str(file),
-                        "language": "unknown",
-                        "score": 0,
-                        "summary": "",
-                        "violations": [],
-                        "error": str(exc),
-                    }
-                results.append(result)
-                progress.advance(task_id)
+            file_iter = iter(enumerate(files))
+            future_map: Dict[Any, tuple] = {}
+            pending: set = set()
+            exhausted = False
+
+            while True:
+                while not exhausted and len(pending) < _SUBMIT_WINDOW:
+                    item = next(file_iter, None)
+                    if item is None:
+                        exhausted = True
+                        break
+                    idx, f = item
+                    future = pool.submit(evaluator.evaluate, str(f), _read_source(f))
+                    future_map[future] = (idx, f)
+                    pending.add(future)
+
+                if not pending:
+                    break
+
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    idx, file = future_map.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as exc:  # noqa: BLE001
+                        result = {
+                            "file": str(file),
+                            "language": "unknown",
+                            "score": 0,
+                            "summary": "",
+                            "violations": [],
+                            "error": str(exc),
+                        }
+                    results[idx] = result
+                    # Render each detail panel as soon as its result lands
+                    # (arrival order) so large scans show output in seconds
+                    # instead of after the last file. The summary table
+                    # still prints in discovery order at the end.
+                    _print_detail(result)
+                done_count += len(done)
+
+        stop_refresh.set()
+        refresher.join()
+        progress.update(task_id, completed=done_count)
 
     elapsed = time.perf_counter() - start
 
-    # 5. Sort by file name
-    results.sort(key=lambda r: r.get("file", ""))
-
-    # 6. Print detailed results per file
-    for r in results:
-        _print_detail(r)
+    # 5. Results already sit in discovery (sorted) order – no sort needed.
+    #    Detail panels were rendered incrementally inside the progress loop.
 
     # 7. Summary table
     _print_summary_table(results)
 
-    # 8. Aggregate stats
-    valid_scores = [
-        r["score"] for r in results 
-        if "error" not in r and not _is_score_na(r.get("score"))
-    ]
-    parse_error_count = sum(1 for r in results if r.get("parse_error"))
-    
-    if valid_scores:
-        avg = sum(valid_scores) / len(valid_scores)
+    # 8. Aggregate stats – one pass over results, locals only.
+    score_total = 0
+    score_count = 0
+    parse_error_count = 0
+    for r in results:
+        if r.get("parse_error"):
+            parse_error_count += 1
+        if "error" not in r and not _is_score_na(r.get("score")):
+            score_total += r["score"]
+            score_count += 1
+
+    if score_count:
+        avg = score_total / score_count
         color = _score_color(int(avg))
         avg_display = f"[{color}]{avg:.1f}[/{color}]/100"
     else:
@@ -7,9 +7,13 @@ can call without knowing the underlying model details.
 
 from __future__ import annotations
 
+import hashlib
 import logging
-from typing import List
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
 
+import numpy as np
 from chromadb.api.types import EmbeddingFunction, Embeddings
 from sentence_transformers import SentenceTransformer
 
@@ -17,6 +21,12 @@ from src.utils.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Process-wide model cache: loading MiniLM weights takes seconds, and every
+# RuleRetriever creates its own LocalEmbeddingFunction. Keyed by model name
+# so differently-configured instances still get the right model.
+_MODEL_CACHE: Dict[str, SentenceTransformer] = {}
+_MODEL_LOCK = threading.Lock()
+
 
 class LocalEmbeddingFunction(EmbeddingFunction[List[str]]):
     """
@@ -29,18 +39,108 @@ class LocalEmbeddingFunction(EmbeddingFunction[List[str]]):
     def __init__(self, model_name: str | None = None) -> None:
         self._model_name = model_name or settings.embedding_model
         self._model: SentenceTransformer | None = None
+        # On-disk vector cache: one float16 .npy per (model, text hash), so
+        # re-ingesting an unchanged corpus or repeating a query skips the
+        # transformer entirely. Cache failures only cost a re-encode.
+        self._cache_dir = (
+            Path(settings.chroma_persist_dir)
+            / "emb_cache"
+            / self._model_name.replace("/", "--")
+        )
 
     # -- lazy loader --------------------------------------------------------
     def _load_model(self) -> SentenceTransformer:
         if self._model is None:
-            logger.info("Loading embedding model '%s' …", self._model_name)
-            self._model = SentenceTransformer(self._model_name)
-            logger.info("Embedding model loaded successfully.")
+            backend = settings.embedding_backend
+            cache_key = f"{self._model_name}:{backend}"
+            with _MODEL_LOCK:
+                model = _MODEL_CACHE.get(cache_key)
+                if model is None:
+                    logger.info(
+                        "Loading embedding model '%s' (backend=%s) …",
+                        self._model_name,
+                        backend,
+                    )
+                    model = self._create_model(backend)
+                    _MODEL_CACHE[cache_key] = model
+                    logger.info("Embedding model loaded successfully.")
+            self._model = model
         return self._model
 
+    def _create_model(self, backend: str) -> SentenceTransformer:
+        """
+        Instantiate the model, preferring ONNX Runtime when configured.
+
+        The ONNX backend needs the optional optimum/onnxruntime packages;
+        when they are missing we fall back to the default torch backend
+        rather than failing the whole pipeline.
+        """
+        if backend == "onnx":
+            try:
+                return SentenceTransformer(self._model_name, backend="onnx")
+            except (ImportError, ValueError) as exc:
+                logger.warning(
+                    "ONNX embedding backend unavailable (%s); "
+                    "falling back to torch.",
+                    exc,
+                )
+        model = SentenceTransformer(self._model_name)
+        # fp16 halves memory bandwidth and doubles tensor-core throughput
+        # on GPU; on CPU it is slower than fp32, so only convert with CUDA.
+        try:
+            import torch
+
+            if torch.cuda.is_available():
+                model = model.half()
+        except ImportError:
+            pass
+        return model
+
+    # -- disk cache ---------------------------------------------------------
+    def _cache_path(self, text: str) -> Path:
+        digest = hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+        return self._cache_dir / f"{digest}.npy"
+
+    def _cache_load(self, text: str) -> Optional[List[float]]:
+        try:
+            return np.load(self._cache_path(text)).astype(np.float32).tolist()
+        except (OSError, ValueError):
+            return None
+
+    def _cache_store(self, text: str, vector: np.ndarray) -> None:
+        try:
+            self._cache_dir.mkdir(parents=True, exist_ok=True)
+            np.save(self._cache_path(text), np.asarray(vector, dtype=np.float16))
+        except OSError as exc:
+            logger.debug("Embedding cache write failed: %s", exc)
+
     # -- ChromaDB interface -------------------------------------------------
     def __call__(self, input: List[str]) -> Embeddings:  # noqa: A002
         """Embed a list of texts and return a list of float-vectors."""
+        out: List[List[float]] = [[] for _ in input]
+        misses: List[int] = []
+        for idx, text in enumerate(input):
+            cached = self._cache_load(text)
+            if cached is None:
+                misses.append(idx)
+            else:
+                out[idx] = cached
+
+        if not misses:
+            return out
+
         model = self._load_model()
-        embeddings = model.encode(input, show_progress_bar=False)
-        return embeddings.tolist()
+        # Smart batching: each mini-batch pads to its longest member, so
+        # encoding in length order packs similar lengths together and
+        # avoids spending FLOPs on PAD tokens. The permutation is inverted
+        # afterwards so callers see embeddings in input order.
+        misses.sort(key=lambda i: len(input[i]))
+        embeddings = model.encode(
+            [input[i] for i in misses],
+            batch_size=settings.embedding_batch_size,
+            show_progress_bar=False,
+        )
+        for pos, emb in zip(misses, embeddings):
+            out[pos] = emb.tolist()
+            self._cache_store(input[pos], emb)
+        return out
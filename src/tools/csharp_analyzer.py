@@ -9,15 +9,53 @@ Tools:
 
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
 import re
 import subprocess
+import threading
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 logger = logging.getLogger(__name__)
 
+# Prefer orjson for SARIF/JSON subprocess output when installed; its
+# JSONDecodeError subclasses json.JSONDecodeError so handling is shared.
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Patterns are compiled once at import – run_complexity and run_dotnet_build
+# are called per file, and re-compiling large patterns there churns the
+# bounded re cache.
+_BUILD_DIAG_RE = re.compile(
+    r"^(?P<file>.+?)\((?P<line>\d+),(?P<col>\d+)\)\s*:\s*"
+    r"(?P<level>error|warning)\s+(?P<id>\w+)\s*:\s*(?P<msg>.+)$",
+    re.MULTILINE,
+)
+_METHOD_RE = re.compile(
+    r"(?:public|private|protected|internal|static|virtual|override|async|abstract|sealed|\s)*"
+    r"\s+\w[\w<>\[\],\s]*?\s+(?P<name>\w+)\s*\([^)]*\)\s*(?:\{)",
+    re.MULTILINE,
+)
+_BRANCH_RE = re.compile(
+    r"\b(?:if|else\s+if|case|for|foreach|while|do|catch)\b|&&|\|\||\?\?"
+)
+
+# dotnet build compiles the whole project, so scanning N files of one
+# project must not pay N builds. Keyed by (csproj, source-tree state); the
+# lock is held across the build so parallel workers asking for the same
+# project wait for one build instead of racing their own.
+_BUILD_CACHE: Dict[tuple, Dict[str, Any]] = {}
+_BUILD_CACHE_MAX = 32
+_BUILD_LOCK = threading.Lock()
+
 
 class CSharpTools:
     """Facade over C# static analysis tools."""
@@ -45,46 +83,74 @@ class CSharpTools:
             )
             return result
 
-        try:
-            proc = subprocess.run(
-                [
-                    "dotnet", "build",
-                    str(csproj),
-                    "--no-restore",
-                    "-consoleloggerparameters:NoSummary",
-                    "-verbosity:quiet",
-                ],
-                capture_output=True,
-                text=True,
-                timeout=120,
-            )
-            output = (proc.stdout or "") + "\n" + (proc.stderr or "")
-            pattern = re.compile(
-                r"^(?P<file>.+?)\((?P<line>\d+),(?P<col>\d+)\)\s*:\s*"
-                r"(?P<level>error|warning)\s+(?P<id>\w+)\s*:\s*(?P<msg>.+)$",
-                re.MULTILINE,
-            )
-            for m in pattern.finditer(output):
-                diag_file = Path(m.group("file")).resolve()
-                if diag_file != src:
-                    continue
-                result["diagnostics"].append({
-                    "id": m.group("id"),
-                    "severity": m.group("level"),
-                    "message": m.group("msg").strip(),
-                    "line": int(m.group("line")),
-                    "column": int(m.group("col")),
-                })
-        except FileNotFoundError:
-            result["error"] = (
-                "'dotnet' CLI not found. Install the .NET SDK to enable build diagnostics."
-            )
-        except subprocess.TimeoutExpired:
-            result["error"] = "dotnet build timed out."
-        except Exception as exc:  # noqa: BLE001
-            result["error"] = f"dotnet build error: {exc}"
+        built = CSharpTools._build_project(csproj)
+        result["error"] = built["error"]
+        result["diagnostics"] = list(built["by_file"].get(str(src), []))
         return result
 
+    @staticmethod
+    def _project_state(csproj: Path) -> str:
+        """Hash of every .cs path + mtime under the project directory."""
+        parts: List[str] = []
+        for cs in sorted(csproj.parent.rglob("*.cs")):
+            try:
+                parts.append(f"{cs}:{cs.stat().st_mtime_ns}")
+            except OSError:
+                continue
+        return hashlib.blake2b("\n".join(parts).encode(), digest_size=16).hexdigest()
+
+    @staticmethod
+    def _build_project(csproj: Path) -> Dict[str, Any]:
+        """
+        Build *csproj* once per source-tree state and return its
+        diagnostics grouped by absolute file path. Cached, so an N-file
+        project scan costs one build plus N dict lookups; any source
+        change invalidates via the mtime hash.
+        """
+        key = (str(csproj), CSharpTools._project_state(csproj))
+        with _BUILD_LOCK:
+            cached = _BUILD_CACHE.get(key)
+            if cached is not None:
+                return cached
+
+            built: Dict[str, Any] = {"by_file": {}, "error": None}
+            try:
+                proc = subprocess.run(
+                    [
+                        "dotnet", "build",
+                        str(csproj),
+                        "--no-restore",
+                        "-consoleloggerparameters:NoSummary",
+                        "-verbosity:quiet",
+                    ],
+                    capture_output=True,
+                    text=True,
+                    timeout=120,
+                )
+                output = (proc.stdout or "") + "\n" + (proc.stderr or "")
+                for m in _BUILD_DIAG_RE.finditer(output):
+                    diag_file = str(Path(m.group("file")).resolve())
+                    built["by_file"].setdefault(diag_file, []).append({
+                        "id": m.group("id"),
+                        "severity": m.group("level"),
+                        "message": m.group("msg").strip(),
+                        "line": int(m.group("line")),
+                        "column": int(m.group("col")),
+                    })
+            except FileNotFoundError:
+                built["error"] = (
+                    "'dotnet' CLI not found. Install the .NET SDK to enable build diagnostics."
+                )
+            except subprocess.TimeoutExpired:
+                built["error"] = "dotnet build timed out."
+            except Exception as exc:  # noqa: BLE001
+                built["error"] = f"dotnet build error: {exc}"
+
+            if len(_BUILD_CACHE) >= _BUILD_CACHE_MAX:
+                _BUILD_CACHE.pop(next(iter(_BUILD_CACHE)))
+            _BUILD_CACHE[key] = built
+            return built
+
     # ------------------------------------------------------------------
     # DevSkim – security linting
     # ------------------------------------------------------------------
@@ -106,13 +172,12 @@ class CSharpTools:
                     "-o", "-",
                 ],
                 capture_output=True,
-                text=True,
                 timeout=60,
             )
-            raw = (proc.stdout or "").strip()
+            raw = (proc.stdout or b"").strip()
             if not raw:
                 return result
-            sarif = json.loads(raw)
+            sarif = _json_loads(raw)
             for run in sarif.get("runs", []):
                 for r in run.get("results", []):
                     loc = (r.get("locations") or [{}])[0]
@@ -159,20 +224,23 @@ class CSharpTools:
             result["error"] = f"Cannot read file: {exc}"
             return result
 
-        method_pattern = re.compile(
-            r"(?:public|private|protected|internal|static|virtual|override|async|abstract|sealed|\s)*"
-            r"\s+\w[\w<>\[\],\s]*?\s+(?P<name>\w+)\s*\([^)]*\)\s*(?:\{)",
-            re.MULTILINE,
-        )
-        branch_pattern = re.compile(
-            r"\b(?:if|else\s+if|case|for|foreach|while|do|catch)\b|&&|\|\||\?\?"
-        )
+        method_matches = list(_METHOD_RE.finditer(source))
+        if not method_matches:
+            return result
+
+        # One branch-keyword scan over the whole file; per-method counts are
+        # then two bisects into the sorted offsets instead of re-running the
+        # regex over each extracted body.
+        branch_offsets = [bm.start() for bm in _BRANCH_RE.finditer(source)]
 
-        for m in method_pattern.finditer(source):
+        for m in method_matches:
             name = m.group("name")
             start = m.end()
-            body = CSharpTools._extract_brace_block(source, start - 1)
-            cc = 1 + len(branch_pattern.findall(body))
+            body_end = CSharpTools._find_block_end(source, start - 1)
+            cc = 1 + (
+                bisect_left(branch_offsets, body_end)
+                - bisect_left(branch_offsets, start)
+            )
             lineno = source[:m.start()].count("\n") + 1
             rank = "A" if cc <= 5 else "B" if cc <= 10 else "C" if cc <= 20 else "D"
             result["blocks"].append({
@@ -229,30 +297,51 @@ class CSharpTools:
         return None
 
     @staticmethod
-    def _extract_brace_block(source: str, open_pos: int) -> str:
-        """Extract text inside a brace-delimited block starting at *open_pos*."""
-        depth = 0
-        i = open_pos
-        while i < len(source):
-            ch = source[i]
-            if ch == "{":
+    def _find_block_end(source: str, open_pos: int) -> int:
+        """
+        Return the index of the ``}`` matching the ``{`` at *open_pos*,
+        or ``len(source)`` when the block is unterminated.
+
+        Jumps between braces with ``str.find`` (C-level scan) instead of
+        stepping one character at a time in the interpreter – most
+        characters are not braces.
+        """
+        depth = 1
+        i = open_pos + 1
+        while True:
+            next_open = source.find("{", i)
+            next_close = source.find("}", i)
+            if next_close == -1:
+                return len(source)
+            if next_open != -1 and next_open < next_close:
                 depth += 1
-            elif ch == "}":
+                i = next_open + 1
+            else:
                 depth -= 1
                 if depth == 0:
-                    return source[open_pos + 1 : i]
-            i += 1
-        return source[open_pos + 1 :]
+                    return next_close
+                i = next_close + 1
+
+    @staticmethod
+    def _extract_brace_block(source: str, open_pos: int) -> str:
+        """Extract text inside a brace-delimited block starting at *open_pos*."""
+        return source[open_pos + 1 : CSharpTools._find_block_end(source, open_pos)]
 
     # ------------------------------------------------------------------
     # Convenience – run all
     # ------------------------------------------------------------------
     def run_all(self, file_path: str) -> Dict[str, Any]:
+        """Run all C# tools concurrently – they are independent subprocesses."""
         from src.tools.semgrep_analyzer import run_semgrep
 
-        return {
-            "dotnet_build": self.run_dotnet_build(file_path),
-            "devskim": self.run_devskim(file_path),
-            "complexity": self.run_complexity(file_path),
-            "semgrep": run_semgrep(file_path),
+        tools = {
+            "dotnet_build": self.run_dotnet_build,
+            "devskim": self.run_devskim,
+            "complexity": self.run_complexity,
+            "semgrep": run_semgrep,
         }
+        with ThreadPoolExecutor(max_workers=len(tools)) as pool:
+            futures = {
+                name: pool.submit(fn, file_path) for name, fn in tools.items()
+            }
+            return {name: f.result() for name, f in futures.items()}
@@ -4,17 +4,272 @@ Shared Semgrep wrapper – language-agnostic pattern-based analysis.
 Semgrep runs community (``--config auto``) or user-specified rules against any
 supported language.  It returns SARIF-style JSON that we normalise into a
 flat list of findings.
+
+Performance note: semgrep's per-invocation startup (Python + OCaml + rule
+compile) is amortized here by batching many targets into one ``semgrep scan``
+(:func:`run_semgrep_batch`) rather than by keeping a resident daemon – the
+CLI exposes no supported scan-over-stdio server (``semgrep lsp`` is an
+editor-protocol surface, not a scan API), so a daemon would pin us to an
+unstable interface for the same win batching already provides.
 """
 
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
+import os
 import subprocess
-from typing import Any, Dict, List
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple
+
+from src.utils.config import MAX_WORKERS, settings
 
 logger = logging.getLogger(__name__)
 
+# Semgrep output parses straight from bytes – orjson (when installed) is
+# several times faster than stdlib json on the multi-MB payloads big
+# rulesets produce, and its JSONDecodeError subclasses json's.
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# With ijson installed, scan output streams through an incremental parser
+# and peak memory stays O(findings) instead of O(raw JSON) – heavy
+# rulesets can emit hundreds of MB. Without it, output is buffered whole.
+try:
+    import ijson
+
+    # ijson's parse errors derive from its own JSONError, not ValueError.
+    _STREAM_PARSE_ERRORS: tuple = (ValueError, ijson.JSONError)
+except ImportError:
+    ijson = None
+    _STREAM_PARSE_ERRORS = (ValueError,)
+
+# Shared read-only default for absent nested dicts in the findings loop.
+_EMPTY: Dict[str, Any] = {}
+
+# Stable argv prefix, built once at import – every flag here is settings-
+# derived and settings are frozen, so per-call list construction only has
+# to append the config and target paths.
+_BASE_ARGV = (
+    "semgrep", "scan",
+    "--json",
+    "--quiet",
+    # No telemetry round-trip (DNS + TLS + HTTP) on the scan critical path.
+    "--metrics=off",
+    # Let semgrep-core parallelize target parsing/matching internally
+    # instead of leaving cores idle on batches.
+    "--jobs", str(MAX_WORKERS),
+    # Bound tail latency: pathological files become skips instead of
+    # consuming the whole subprocess budget.
+    "--timeout", str(settings.semgrep_rule_timeout),
+    "--timeout-threshold", str(settings.semgrep_timeout_threshold),
+    "--max-target-bytes", str(settings.semgrep_max_target_bytes),
+    "--max-memory", str(settings.semgrep_max_memory_mb),
+)
+
+# Belt-and-braces alongside --metrics=off: also silence telemetry and the
+# startup version check for semgrep builds that only honour the env vars.
+_SCAN_ENV = {
+    **os.environ,
+    "SEMGREP_SEND_METRICS": "off",
+    "SEMGREP_ENABLE_VERSION_CHECK": "0",
+}
+
+# rule_id/severity/category repeat across thousands of findings; interning
+# collapses the duplicates to one str object each and lets downstream
+# grouping hash/compare by identity.
+_intern = sys.intern
+
+
+class Finding(NamedTuple):
+    """
+    One normalised Semgrep match.
+
+    A NamedTuple instead of a 6-key dict: a fraction of the per-row memory
+    on large scans and faster construction/field access. Use ``_asdict()``
+    when a finding needs to cross a JSON boundary.
+    """
+
+    rule_id: str
+    severity: str
+    message: str
+    line: int
+    end_line: int
+    category: str
+
+# Extra argv enabling semgrep's on-disk AST parsing cache, probed once per
+# process: the flag only exists on some builds (older/experimental), so we
+# check `semgrep scan --help` and fall back to no flag silently. When
+# supported, cached ASTs avoid re-parsing unchanged targets across calls.
+_parsing_cache_args: List[str] | None = None
+
+
+def _get_parsing_cache_args() -> List[str]:
+    global _parsing_cache_args
+    if _parsing_cache_args is None:
+        args: List[str] = []
+        try:
+            proc = subprocess.run(
+                ["semgrep", "scan", "--help"],
+                capture_output=True,
+                text=True,
+                timeout=30,
+            )
+            if "--use-parsing-cache" in (proc.stdout or ""):
+                cache_dir = Path(settings.chroma_persist_dir).parent / ".semgrep_cache"
+                cache_dir.mkdir(parents=True, exist_ok=True)
+                args = ["--use-parsing-cache", str(cache_dir)]
+        except Exception:  # noqa: BLE001 – probe failures just disable the cache
+            pass
+        _parsing_cache_args = args
+    return _parsing_cache_args
+
+
+# On-disk scan-result cache keyed by (file content, config, semgrep
+# version): agent loops re-analyze unchanged files, and a hit skips the
+# semgrep invocation entirely. Failures degrade to a normal scan.
+_semgrep_version: str | None = None
+
+
+def _get_semgrep_version() -> str:
+    global _semgrep_version
+    if _semgrep_version is None:
+        try:
+            proc = subprocess.run(
+                ["semgrep", "--version"], capture_output=True, timeout=30
+            )
+            _semgrep_version = (proc.stdout or b"").decode("utf-8", "replace").strip()
+        except Exception:  # noqa: BLE001
+            _semgrep_version = "unknown"
+    return _semgrep_version
+
+
+def _result_cache_dir() -> Path:
+    return Path(settings.chroma_persist_dir) / "semgrep_results"
+
+
+def _content_digest(file_path: str, config: str) -> str | None:
+    """Cache key for *file_path* under *config*, or None when unreadable."""
+    try:
+        raw = Path(file_path).read_bytes()
+    except OSError:
+        return None
+    h = hashlib.blake2b(raw, digest_size=16)
+    h.update(config.encode())
+    h.update(_get_semgrep_version().encode())
+    return h.hexdigest()
+
+
+def _cache_load(digest: str) -> List[List[Any]] | None:
+    try:
+        raw = (_result_cache_dir() / f"{digest}.json").read_bytes()
+        return _json_loads(raw)
+    except (OSError, ValueError):
+        return None
+
+
+def _cache_store(digest: str, findings: List[Finding]) -> None:
+    try:
+        cache_dir = _result_cache_dir()
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        (cache_dir / f"{digest}.json").write_text(
+            json.dumps([list(f) for f in findings]), encoding="utf-8"
+        )
+    except OSError as exc:
+        logger.debug("Semgrep result cache write failed: %s", exc)
+
+
+# Below this size a whitespace-only file cannot yield a meaningful finding,
+# so it is not worth a scan slot.
+_TRIVIAL_SIZE = 64
+
+
+def _is_trivial_target(file_path: str) -> bool:
+    """
+    True for empty or whitespace-only tiny files and for binaries (null
+    byte in the first KiB) – semgrep has nothing to match in either, but
+    would still charge the full invocation cost.
+    """
+    try:
+        size = os.path.getsize(file_path)
+    except OSError:
+        return False
+    if size == 0:
+        return True
+    try:
+        with open(file_path, "rb") as fh:
+            head = fh.read(1024)
+    except OSError:
+        return False
+    if size < _TRIVIAL_SIZE and not head.strip():
+        return True
+    return b"\0" in head
+
+
+def _store_scan_results(
+    results: Dict[str, Dict[str, Any]],
+    pending: List[str],
+    digests: Dict[str, str],
+) -> None:
+    """Persist the findings of every cleanly scanned pending file."""
+    for key in pending:
+        digest = digests.get(key)
+        if digest is not None and results[key]["error"] is None:
+            _cache_store(digest, results[key]["findings"])
+
+
+def _run_scan(argv: List[str], timeout: int) -> tuple[List[Dict[str, Any]], int, bytes]:
+    """
+    Execute a semgrep scan and return ``(match items, returncode, stderr)``.
+    stderr stays bytes – callers decode only the tail they report.
+
+    With ijson installed, stdout streams through an incremental parser so
+    the raw JSON payload is never held in memory whole; otherwise the
+    output is buffered and parsed in one go.
+    """
+    if ijson is not None:
+        proc = subprocess.Popen(
+            argv,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            bufsize=1 << 20,
+            env=_SCAN_ENV,
+        )
+        try:
+            # Drain stderr on the side so a chatty scan (many parse
+            # warnings) cannot fill the pipe and deadlock against our
+            # stdout read.
+            stderr_chunks: List[bytes] = []
+            drainer = threading.Thread(
+                target=lambda: stderr_chunks.append(proc.stderr.read()),
+                daemon=True,
+            )
+            drainer.start()
+            try:
+                items = list(ijson.items(proc.stdout, "results.item"))
+            except _STREAM_PARSE_ERRORS:
+                items = []  # empty or non-JSON stdout (error exit)
+            proc.wait(timeout=timeout)
+            drainer.join(timeout=5)
+        except Exception:
+            proc.kill()
+            proc.wait()
+            raise
+        return items, proc.returncode, b"".join(stderr_chunks)
+
+    proc = subprocess.run(argv, capture_output=True, timeout=timeout, env=_SCAN_ENV)
+    raw = (proc.stdout or b"").strip()
+    items = _json_loads(raw).get("results", []) if raw else []
+    return items, proc.returncode, proc.stderr or b""
+
 
 def run_semgrep(file_path: str, *, config: str = "auto") -> Dict[str, Any]:
     """
@@ -36,51 +291,143 @@ def run_semgrep(file_path: str, *, config: str = "auto") -> Dict[str, Any]:
         ``{"findings": [{"rule_id", "severity", "message", "line",
         "end_line", "category"}], "error": str | None}``
     """
-    result: Dict[str, Any] = {"findings": [], "error": None}
+    return run_semgrep_batch([file_path], config=config)[str(file_path)]
+
+
+def run_semgrep_batch(
+    file_paths: List[str], *, config: str = "auto"
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Run Semgrep once over *file_paths* and demultiplex findings per file.
+
+    One invocation amortizes Semgrep's startup, rule fetch, and rule
+    compilation (one to several seconds) across the whole batch instead of
+    paying it per file.
+
+    Returns
+    -------
+    dict
+        ``{file_path: result}`` where each result has the same shape as
+        :func:`run_semgrep`.
+    """
+    # file_path keys are declared str; only coerce the stragglers.
+    results: Dict[str, Dict[str, Any]] = {
+        (p if type(p) is str else str(p)): {"findings": [], "error": None}
+        for p in file_paths
+    }
+    if not results:
+        return results
+
+    # Content-hash cache: files whose (content, config, semgrep version)
+    # digest already has a stored result skip the scan entirely.
+    digests: Dict[str, str] = {}
+    pending: List[str] = []
+    for key in results:
+        if _is_trivial_target(key):
+            continue  # empty/whitespace/binary: nothing for semgrep to match
+        digest = _content_digest(key, config)
+        if digest is not None:
+            digests[key] = digest
+            cached = _cache_load(digest)
+            if cached is not None:
+                try:
+                    results[key]["findings"] = [Finding(*f) for f in cached]
+                    continue
+                except TypeError:
+                    pass  # wrong-shape entry (format change): treat as miss
+        pending.append(key)
+    if not pending:
+        return results
+
+    by_abs = {str(Path(p).resolve()): p for p in pending}
     try:
-        proc = subprocess.run(
-            [
-                "semgrep", "scan",
-                "--json",
-                "--quiet",
-                "--config", config,
-                str(file_path),
-            ],
-            capture_output=True,
-            text=True,
-            timeout=120,
+        argv = [
+            *_BASE_ARGV,
+            *_get_parsing_cache_args(),
+            "--config", config,
+            *pending,
+        ]
+        items, returncode, stderr = _run_scan(
+            argv, timeout=120 + 30 * len(pending)
         )
-        raw = (proc.stdout or "").strip()
-        if not raw:
-            if proc.returncode != 0 and proc.stderr:
-                err_hint = proc.stderr.strip().splitlines()[-1][:200]
-                result["error"] = f"Semgrep exited {proc.returncode}: {err_hint}"
-            return result
-
-        data = json.loads(raw)
-        for r in data.get("results", []):
-            extra = r.get("extra", {})
-            metadata = extra.get("metadata", {})
-            result["findings"].append({
-                "rule_id": r.get("check_id", ""),
-                "severity": extra.get("severity", "WARNING").upper(),
-                "message": extra.get("message", ""),
-                "line": r.get("start", {}).get("line", 0),
-                "end_line": r.get("end", {}).get("line", 0),
-                "category": metadata.get("category", ""),
-            })
+        if not items:
+            if returncode != 0 and stderr.strip():
+                # Only the reported tail is ever decoded.
+                tail = stderr.strip().rsplit(b"\n", 1)[-1][:200]
+                err_hint = tail.decode("utf-8", "replace")
+                for key in pending:
+                    results[key]["error"] = f"Semgrep exited {returncode}: {err_hint}"
+            else:
+                _store_scan_results(results, pending, digests)
+            return results
+
+        # Hot loop for large rulesets (thousands of matches): bind the
+        # nested dicts and target lists once per finding instead of
+        # re-chaining .get with fresh default literals.
+        findings_by_key = {k: results[k]["findings"] for k in pending}
+        for r in items:
+            key = by_abs.get(str(Path(r.get("path", "")).resolve()))
+            if key is None:
+                continue
+            extra = r.get("extra") or _EMPTY
+            metadata = extra.get("metadata") or _EMPTY
+            start = r.get("start") or _EMPTY
+            end = r.get("end") or _EMPTY
+            findings_by_key[key].append(Finding(
+                rule_id=_intern(r.get("check_id", "") or ""),
+                severity=_intern((extra.get("severity") or "WARNING").upper()),
+                message=extra.get("message", ""),
+                line=start.get("line", 0),
+                end_line=end.get("line", 0),
+                category=_intern(metadata.get("category", "") or ""),
+            ))
+        _store_scan_results(results, pending, digests)
     except FileNotFoundError:
-        result["error"] = (
-            "'semgrep' CLI not found. "
-            "Install via: pip install semgrep  (or pipx install semgrep)"
-        )
+        for r in results.values():
+            r["error"] = (
+                "'semgrep' CLI not found. "
+                "Install via: pip install semgrep  (or pipx install semgrep)"
+            )
     except subprocess.TimeoutExpired:
-        result["error"] = "Semgrep timed out."
+        for r in results.values():
+            r["error"] = "Semgrep timed out."
     except (json.JSONDecodeError, KeyError) as exc:
-        result["error"] = f"Failed to parse Semgrep output: {exc}"
+        for r in results.values():
+            r["error"] = f"Failed to parse Semgrep output: {exc}"
     except Exception as exc:  # noqa: BLE001
-        result["error"] = f"Semgrep execution error: {exc}"
-    return result
+        for r in results.values():
+            r["error"] = f"Semgrep execution error: {exc}"
+    return results
+
+
+def run_semgrep_many(
+    groups: Dict[str, List[str]]
+) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """
+    Run one :func:`run_semgrep_batch` per config group concurrently.
+
+    Parameters
+    ----------
+    groups : dict
+        ``{config: [file_path, ...]}`` – e.g. files grouped per language
+        ruleset.
+
+    Returns
+    -------
+    dict
+        ``{config: {file_path: result}}``. The subprocesses are I/O bound,
+        so a thread pool overlaps them up to the configured worker count.
+    """
+    if not groups:
+        return {}
+    with ThreadPoolExecutor(
+        max_workers=min(MAX_WORKERS, len(groups))
+    ) as pool:
+        futures = {
+            cfg: pool.submit(run_semgrep_batch, paths, config=cfg)
+            for cfg, paths in groups.items()
+        }
+        return {cfg: f.result() for cfg, f in futures.items()}
 
 
 def format_semgrep_summary(semgrep_result: Dict[str, Any]) -> str:
@@ -89,12 +436,20 @@ def format_semgrep_summary(semgrep_result: Dict[str, Any]) -> str:
     """
     findings = semgrep_result.get("findings", [])
     if findings:
-        lines: List[str] = []
-        for f in findings[:30]:
-            rule_short = f["rule_id"].rsplit(".", 1)[-1] if f["rule_id"] else "?"
-            lines.append(
-                f"  L{f['line']}: [{f['severity']}] {rule_short} – {f['message']}"
-            )
+        # Native shape is Finding; dict-shaped rows (older cached results,
+        # hand-built fixtures) are adapted once up front so the hot path
+        # stays attribute access with no per-row isinstance.
+        if isinstance(findings[0], dict):
+            findings = [Finding(**f) for f in findings[:30]]
+        # rpartition allocates one tuple (vs rsplit's list) and message is
+        # truncated up front - pattern-rule messages can run to several KB
+        # and this string lands in every LLM prompt.
+        lines = [
+            f"  L{f.line}: [{f.severity}] "
+            f"{f.rule_id.rpartition('.')[2] or f.rule_id or '?'} – "
+            f"{f.message[:240]}"
+            for f in findings[:30]
+        ]
         return "\n".join(lines)
     if semgrep_result.get("error"):
         return f"  Error: {semgrep_result['error']}"
@@ -18,7 +18,7 @@ from pathlib import Path
 _PROJECT_ROOT = Path(__file__).resolve().parents[2]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Settings:
     """Immutable, thread-safe configuration object."""
 
@@ -75,6 +75,10 @@ class Settings:
     embedding_model: str = os.getenv(
         "EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2"
     )
+    embedding_batch_size: int = int(os.getenv("EMBEDDING_BATCH_SIZE", "64"))
+    # "torch" (default) or "onnx" – the ONNX backend runs 3-4x faster on
+    # CPU but needs the optional optimum/onnxruntime packages.
+    embedding_backend: str = os.getenv("EMBEDDING_BACKEND", "torch")
     chroma_persist_dir: str = os.getenv(
         "CHROMA_PERSIST_DIR",
         str(_PROJECT_ROOT / ".chromadb"),
@@ -86,6 +90,18 @@ class Settings:
     )
     rag_top_k: int = int(os.getenv("RAG_TOP_K", "3"))
 
+    # ── Semgrep ───────────────────────────────────────────────────────
+    # Per-rule timeout, timeouts tolerated before a file is skipped, and
+    # caps on target size / matcher memory. Together they turn pathological
+    # files into silent skips instead of letting one file eat the whole
+    # subprocess wall-clock budget.
+    semgrep_rule_timeout: int = int(os.getenv("SEMGREP_RULE_TIMEOUT", "5"))
+    semgrep_timeout_threshold: int = int(os.getenv("SEMGREP_TIMEOUT_THRESHOLD", "3"))
+    semgrep_max_target_bytes: int = int(
+        os.getenv("SEMGREP_MAX_BYTES", str(2 * 1024 * 1024))
+    )
+    semgrep_max_memory_mb: int = int(os.getenv("SEMGREP_MAX_MEMORY_MB", "2048"))
+
     # ── Concurrency ───────────────────────────────────────────────────
     max_workers: int = int(os.getenv("MAX_WORKERS", "4"))
 
@@ -95,3 +111,11 @@ class Settings:
 
 # Singleton instance – import this everywhere.
 settings = Settings()
+
+# Hot-path aliases: a plain module global skips the dataclass attribute
+# descriptor on every read. Use these where a value is consumed per call
+# or per loop iteration; everything else should keep going through
+# ``settings`` for discoverability.
+MAX_WORKERS = settings.max_workers
+LLM_TIMEOUT = settings.llm_timeout
+RAG_TOP_K = settings.rag_top_k